@@ -86,8 +86,8 @@ def main():
         ["🔮 Welcome", "📤 Data Upload", "⚡ Preprocessing", "🚀 Model Training", "📊 Visualization"]
     )
     
-    # Initialize session state
-    for key in ['data', 'processed_data', 'model', 'preprocessing_steps']:
+    # Initialize session state ('data' and 'processed_data' hold keys into the shared dataset store)
+    for key in ['data', 'data_source', 'processed_data', 'model', 'training_state', 'preprocessing_steps']:
         if key not in st.session_state:
             st.session_state[key] = None
             
@@ -128,6 +128,7 @@ def welcome_page():
         
         1. **Data Upload**
            - Support for CSV, Excel, JSON, Parquet Files
+           - Pick sheets, columns and row filters before loading
            - Automatic data type detection
            - Basic statistics and overview
         
@@ -141,6 +142,7 @@ def welcome_page():
            - Multiple algorithms available
            - Automatic validation
            - Performance metrics
+           - Incremental retraining when adding trees or boosting rounds
            - Downloadable models
         
         4. **Visualization**
@@ -0,0 +1,207 @@
+"""Headless batch runner for scheduled training jobs.
+
+Runs the same upload -> preprocess -> train pipeline as the Streamlit pages,
+driven by a JSON config instead of widgets:
+
+    python batch.py jobs.json [--workers 4] [--output-dir artifacts]
+
+Example config:
+
+    {
+        "output_dir": "artifacts",
+        "defaults": {"problem_type": "Classification", "cv_folds": 5},
+        "jobs": [
+            {
+                "name": "churn",
+                "input": "data/churn.csv",
+                "columns": ["age", "plan", "tenure", "churned"],
+                "filters": [["tenure", ">=", 3]],
+                "target": "churned",
+                "model": "RandomForestClassifier",
+                "model_params": {"n_estimators": 300},
+                "preprocessing": [
+                    {"step": "missing", "column": "age", "strategy": "Median"},
+                    {"step": "encode", "column": "plan", "encoding": "One-Hot Encoding"}
+                ]
+            }
+        ]
+    }
+
+"columns", "filters" and "sheet" (Excel) are optional and pushed down into the
+reader like the Load Options on the upload page. The "preprocessing" list uses
+the same format as the plan shown on the Preprocessing page. Each job writes
+metrics.json, timings.json and model.pkl to <output_dir>/<name>/, and a
+summary.json is written for the whole run.
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from upload import SUPPORTED_FORMATS, load_data
+from preprocess import apply_preprocessing
+from modeltrain import train_model
+
+JOB_DEFAULTS = {
+    "problem_type": "Classification",
+    "sheet": 0,
+    "columns": None,
+    "filters": [],
+    "preprocessing": [],
+    "model_params": {},
+    "test_size": 0.2,
+    "cv_folds": 5,
+    "random_state": 42
+}
+
+
+def _write_json(path, payload):
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, default=float)
+
+
+def run_job(job, output_dir):
+    """Run a single job end to end and write its artifacts"""
+    job_dir = os.path.join(output_dir, job["name"])
+    os.makedirs(job_dir, exist_ok=True)
+    timings = {}
+
+    start = time.perf_counter()
+    file_extension = job["input"].rsplit('.', 1)[-1].lower()
+    if file_extension not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format: {file_extension}")
+    data = load_data(job["input"], file_extension, columns=job["columns"],
+                     filters=job["filters"], sheet_name=job["sheet"])
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = apply_preprocessing(data, job["preprocessing"])
+    timings["preprocess"] = time.perf_counter() - start
+
+    result = train_model(
+        data, job["target"], job["problem_type"], job["model"],
+        test_size=job["test_size"], cv_folds=job["cv_folds"],
+        random_state=job["random_state"], model_params=job["model_params"]
+    )
+    timings.update(result["timings"])
+
+    start = time.perf_counter()
+    with open(os.path.join(job_dir, "model.pkl"), "wb") as f:
+        pickle.dump(result["model"], f)
+    timings["save"] = time.perf_counter() - start
+    timings["total"] = sum(timings.values())
+
+    _write_json(os.path.join(job_dir, "metrics.json"), {
+        "model": job["model"],
+        "problem_type": job["problem_type"],
+        "rows": data.shape[0],
+        "features": result["X"].shape[1],
+        "metrics": result["metrics"]
+    })
+    _write_json(os.path.join(job_dir, "timings.json"), timings)
+    return timings
+
+
+def _run_job_safely(job, output_dir):
+    # Runs inside a worker process; failures are reported, not raised, so one
+    # bad dataset does not abort the rest of the batch.
+    try:
+        timings = run_job(job, output_dir)
+        return {"name": job["name"], "status": "ok", "timings": timings}
+    except Exception as e:
+        return {
+            "name": job["name"],
+            "status": "error",
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }
+
+
+def load_config(path):
+    """Read a batch config and fill every job with the run-wide defaults"""
+    with open(path) as f:
+        config = json.load(f)
+
+    defaults = {**JOB_DEFAULTS, **config.get("defaults", {})}
+    jobs = []
+    for i, job in enumerate(config.get("jobs", [])):
+        job = {**defaults, **job}
+        for key in ("input", "target", "model"):
+            if key not in job:
+                raise ValueError(f"Job {i} is missing required key '{key}'")
+        job.setdefault("name", os.path.splitext(os.path.basename(job["input"]))[0])
+        # Names become artifact directories, so they must stay inside output_dir
+        name = job["name"]
+        if (not isinstance(name, str) or name in ("", ".", "..")
+                or "/" in name or "\\" in name or os.sep in name
+                or os.path.splitdrive(name)[0]):
+            raise ValueError(f"Job {i} has an invalid name: {name!r}")
+        jobs.append(job)
+
+    names = [job["name"] for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Job names must be unique")
+
+    config["jobs"] = jobs
+    return config
+
+
+def run_batch(config, output_dir=None, workers=None):
+    """Run all jobs of a config across a process pool and write summary.json"""
+    output_dir = output_dir or config.get("output_dir", "artifacts")
+    workers = workers or config.get("workers")
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_job_safely, job, output_dir) for job in config["jobs"]]
+        for job, future in zip(config["jobs"], futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker itself died (e.g. killed for memory, crash in a
+                # native library); jobs that already finished keep their result
+                results.append({
+                    "name": job["name"],
+                    "status": "error",
+                    "error": f"Worker failed: {e!r}",
+                    "traceback": traceback.format_exc()
+                })
+
+    summary = {
+        "total_seconds": time.perf_counter() - start,
+        "succeeded": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] == "error" for r in results),
+        "jobs": results
+    }
+    _write_json(os.path.join(output_dir, "summary.json"), summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run AI Data Wizard training jobs without the UI")
+    parser.add_argument("config", help="Path to a JSON batch config")
+    parser.add_argument("--workers", type=int, help="Number of parallel worker processes")
+    parser.add_argument("--output-dir", help="Directory for artifacts (overrides the config)")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    summary = run_batch(config, output_dir=args.output_dir, workers=args.workers)
+
+    for result in summary["jobs"]:
+        if result["status"] == "ok":
+            print(f"✅ {result['name']}: {result['timings']['total']:.2f}s")
+        else:
+            print(f"❌ {result['name']}: {result['error']}")
+    print(f"🎉 {summary['succeeded']} succeeded, {summary['failed']} failed "
+          f"in {summary['total_seconds']:.2f}s")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+import streamlit as st
+import pandas as pd
+import pyarrow as pa
+import atexit
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Process-wide limits, configurable per deployment
+DEFAULT_MEMORY_LIMIT_MB = int(os.environ.get("AI_DATA_WIZARD_STORE_MEMORY_MB", 4096))
+DEFAULT_DISK_LIMIT_MB = int(os.environ.get("AI_DATA_WIZARD_STORE_DISK_MB", 20480))
+DEFAULT_SPILL_DIR = os.environ.get(
+    "AI_DATA_WIZARD_STORE_DIR",
+    os.path.join(tempfile.gettempdir(), "ai_data_wizard_store")
+)
+
+
+def fingerprint_bytes(raw, *load_options):
+    """Content fingerprint of an uploaded file and how it is loaded, usable before parsing it"""
+    digest = hashlib.sha256(raw)
+    digest.update(repr(load_options).encode())
+    return f"file-{digest.hexdigest()}"
+
+
+def fingerprint_frame(data):
+    """Content fingerprint of a DataFrame (values, index, column names and dtypes)"""
+    digest = hashlib.sha256(repr(list(zip(data.columns, data.dtypes))).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    except TypeError:
+        # Unhashable cells (e.g. lists from nested JSON)
+        digest.update(pickle.dumps(data))
+    return f"frame-{digest.hexdigest()}"
+
+
+class DatasetStore:
+    """Immutable, content-addressed datasets shared by all sessions of a server.
+
+    Datasets are kept as Arrow tables up to ``memory_limit`` bytes. Beyond that
+    the least recently used ones are spilled to ``spill_dir`` and served from
+    there memory-mapped, so the OS page cache is shared instead of every session
+    holding its own copy. Spill files beyond ``disk_limit`` bytes are deleted,
+    least recently used first, and all of them are removed at exit. Frames
+    Arrow cannot represent (mixed-type object columns) are kept as DataFrames
+    and spilled with pickle.
+
+    Pandas frames handed out by ``get_dataframe`` are materialized once per key
+    and shared by every session. They count against ``memory_limit`` too and
+    are dropped before any table is spilled, since they can be rebuilt.
+    """
+
+    def __init__(self, memory_limit=DEFAULT_MEMORY_LIMIT_MB * 1024**2,
+                 disk_limit=DEFAULT_DISK_LIMIT_MB * 1024**2, spill_dir=DEFAULT_SPILL_DIR):
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()  # key -> (pa.Table | pd.DataFrame, nbytes)
+        self._spilling = {}  # key -> value, evicted but still being written
+        self._spilled = OrderedDict()  # key -> (path on disk, file size)
+        self._frames = OrderedDict()  # key -> (materialized pd.DataFrame, nbytes)
+        self._memory_used = 0
+        self._disk_used = 0
+        self._lock = threading.Lock()
+        os.makedirs(spill_dir, exist_ok=True)
+        atexit.register(self.clear)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries or key in self._spilling or key in self._spilled
+
+    def put(self, data, key=None):
+        """Add a DataFrame to the store and return its key; duplicates are stored once.
+
+        The store keeps ``data`` as the shared frame for the key, so it must not
+        be modified afterwards.
+        """
+        key = key or fingerprint_frame(data)
+        if key in self:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return key
+
+        frame_nbytes = int(data.memory_usage(deep=True).sum())
+        try:
+            value = pa.Table.from_pandas(data)
+            nbytes = value.nbytes
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # The frame itself is the entry; no separate materialized copy
+            value, nbytes = data, frame_nbytes
+
+        victims = []
+        with self._lock:
+            if key not in self._entries and key not in self._spilling and key not in self._spilled:
+                self._entries[key] = (value, nbytes)
+                self._memory_used += nbytes
+                if value is not data:
+                    self._add_frame(key, data, frame_nbytes)
+                victims = self._pop_victims()
+        self._spill_victims(victims)
+        return key
+
+    def get(self, key):
+        """Return the stored Arrow table (or DataFrame fallback) for a key"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            if key in self._spilling:
+                return self._spilling[key]
+            if key not in self._spilled:
+                raise KeyError(key)
+            self._spilled.move_to_end(key)
+            path = self._spilled[key][0]
+        try:
+            if path.endswith(".arrow"):
+                # Buffers keep the mapping alive after this function returns
+                return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            # Spill file was removed behind our back
+            with self._lock:
+                if key in self._spilled and self._spilled[key][0] == path:
+                    self._disk_used -= self._spilled.pop(key)[1]
+            raise KeyError(key)
+
+    def get_dataframe(self, key):
+        """Return the shared pandas DataFrame for a key; copy it before modifying it"""
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key][0]
+            entry = self._entries.get(key)
+            if entry is not None and isinstance(entry[0], pd.DataFrame):
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        value = self.get(key)
+        data = value.to_pandas() if isinstance(value, pa.Table) else value
+        nbytes = int(data.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._frames:
+                # Another session materialized it meanwhile
+                self._frames.move_to_end(key)
+                return self._frames[key][0]
+            self._add_frame(key, data, nbytes)
+            victims = self._pop_victims()
+        self._spill_victims(victims)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_memory": len(self._entries),
+                "frames": len(self._frames),
+                "spilled": len(self._spilled),
+                "memory_used": self._memory_used,
+                "memory_limit": self.memory_limit,
+                "disk_used": self._disk_used,
+                "disk_limit": self.disk_limit
+            }
+
+    def clear(self):
+        """Drop every dataset and delete all spill files"""
+        with self._lock:
+            paths = [path for path, _ in self._spilled.values()]
+            self._entries.clear()
+            self._frames.clear()
+            self._spilled.clear()
+            self._memory_used = self._disk_used = 0
+        self._unlink(paths)
+
+    def _add_frame(self, key, data, nbytes):
+        # Called with the lock held
+        self._frames[key] = (data, nbytes)
+        self._memory_used += nbytes
+
+    def _pop_victims(self):
+        # Called with the lock held. Materialized frames are dropped first since
+        # they can be rebuilt. Table victims stay readable from _spilling until
+        # _spill_victims has written them, which happens outside the lock.
+        while self._memory_used > self.memory_limit and self._frames:
+            _, (_, nbytes) = self._frames.popitem(last=False)
+            self._memory_used -= nbytes
+        victims = []
+        while self._memory_used > self.memory_limit and self._entries:
+            key, (value, nbytes) = self._entries.popitem(last=False)
+            self._memory_used -= nbytes
+            self._spilling[key] = value
+            victims.append((key, value))
+        return victims
+
+    def _spill_victims(self, victims):
+        for key, value in victims:
+            path = self._spill(key, value)
+            size = os.path.getsize(path)
+            with self._lock:
+                self._spilling.pop(key, None)
+                if key not in self._spilled:
+                    self._spilled[key] = (path, size)
+                    self._disk_used += size
+                expired = []
+                while self._disk_used > self.disk_limit and self._spilled:
+                    _, (old_path, old_size) = self._spilled.popitem(last=False)
+                    self._disk_used -= old_size
+                    expired.append(old_path)
+            self._unlink(expired)
+
+    def _spill(self, key, value):
+        extension = ".arrow" if isinstance(value, pa.Table) else ".pkl"
+        path = os.path.join(self.spill_dir, key + extension)
+        if os.path.exists(path):
+            return path
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if isinstance(value, pa.Table):
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, value.schema) as writer:
+                    writer.write_table(value)
+        else:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _unlink(paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                # Already gone, or still mapped on platforms that forbid it
+                pass
+
+
+@st.cache_resource
+def get_dataset_store():
+    """The store shared by every session of this Streamlit server"""
+    return DatasetStore()
+
+
+def load_session_dataset(name):
+    """Resolve the dataset referenced by st.session_state[name] into a DataFrame.
+
+    The frame is shared with other sessions through the store; copy it before
+    modifying it.
+    """
+    key = st.session_state.get(name)
+    if key is None:
+        return None
+    try:
+        return get_dataset_store().get_dataframe(key)
+    except (KeyError, FileNotFoundError):
+        # Dataset was dropped from the store (disk cap or server restart)
+        st.session_state[name] = None
+        return None
+
+
+def store_session_dataset(name, data, key=None):
+    """Put a DataFrame into the shared store and keep only its key in the session"""
+    st.session_state[name] = get_dataset_store().put(data, key=key)
+    return st.session_state[name]
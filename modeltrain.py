@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, cross_val_score, check_cv
 from sklearn.metrics import mean_squared_error, accuracy_score, classification_report
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.linear_model import LogisticRegression, LinearRegression
@@ -13,6 +13,8 @@ import plotly.graph_objects as go
 from io import BytesIO
 import pickle
 import base64
+from datastore import load_session_dataset, fingerprint_frame
+import time
 
 # Define model dictionaries
 CLASSIFICATION_MODELS = {
@@ -31,6 +33,183 @@ REGRESSION_MODELS = {
     "🚀 XGBoost (Champion Performance) 🏆": XGBRegressor
 }
 
+# Models that can keep training from a previous fit: (size parameter, default)
+GROWABLE_PARAMS = {
+    RandomForestClassifier: ("n_estimators", 100),
+    RandomForestRegressor: ("n_estimators", 100),
+    XGBClassifier: ("n_estimators", 100),
+    XGBRegressor: ("n_estimators", 100),
+    LogisticRegression: ("max_iter", 100)
+}
+
+def resolve_model(problem_type, name):
+    """Look up a model class by its display label or class name"""
+    model_dict = CLASSIFICATION_MODELS if problem_type == "Classification" else REGRESSION_MODELS
+    for label, model_cls in model_dict.items():
+        if name in (label, model_cls.__name__):
+            return model_cls
+    raise ValueError(f"Unknown {problem_type.lower()} model: {name}")
+
+def evaluate_model(model, problem_type, X_test, y_test, y_pred, cv_scores=None):
+    """Compute the metrics shown on the training page"""
+    if problem_type == "Classification":
+        return {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "cv_mean": cv_scores.mean(),
+            "cv_std": cv_scores.std(),
+            "classification_report": classification_report(y_test, y_pred, output_dict=True)
+        }
+    mse = mean_squared_error(y_test, y_pred)
+    return {
+        "mse": mse,
+        "rmse": np.sqrt(mse),
+        "r2": model.score(X_test, y_test)
+    }
+
+def fit_increment(model_cls, params, X_train, y_train, size, previous=None, previous_size=0):
+    """Fit a growable model up to ``size``, continuing from ``previous`` when given.
+
+    Only the added trees, boosting rounds or solver iterations are trained.
+    RandomForest and LogisticRegression grow ``previous`` in place. Their
+    warm_start setting is restored afterwards and the size parameter reports
+    the total; if the fit fails, all parameters are restored.
+    """
+    param = GROWABLE_PARAMS[model_cls][0]
+    if previous is None:
+        model = model_cls(**{**params, param: size})
+        model.fit(X_train, y_train)
+        return model
+    
+    added = size - previous_size
+    if added == 0:
+        return previous
+    if model_cls in (XGBClassifier, XGBRegressor):
+        # New booster rounds on top of the previous ones
+        model = model_cls(**{**params, param: added})
+        model.fit(X_train, y_train, xgb_model=previous.get_booster())
+        # Report the total number of rounds the booster now holds
+        model.set_params(**{param: size})
+        return model
+    
+    model = previous
+    old_params = model.get_params()
+    old_params = {"warm_start": old_params["warm_start"], param: old_params[param]}
+    if param == "n_estimators":
+        # RandomForest keeps its fitted trees and only grows the new ones
+        model.set_params(warm_start=True, n_estimators=size)
+    else:
+        # LogisticRegression restarts the solver from the previous coefficients
+        model.set_params(warm_start=True, max_iter=added)
+    try:
+        model.fit(X_train, y_train)
+    except Exception:
+        model.set_params(**old_params)
+        raise
+    # Leave a plain model behind: a later fit() starts over and max_iter is the total
+    model.set_params(warm_start=old_params["warm_start"], **{param: size})
+    return model
+
+def train_model(data, target_col, problem_type, model_name, test_size=0.2, cv_folds=5,
+                random_state=42, model_params=None, incremental=False, previous=None, data_key=None):
+    """Split, fit and evaluate a model without any Streamlit interaction.
+
+    With ``incremental`` set, models in GROWABLE_PARAMS return a ``state`` that
+    can be passed back as ``previous`` to continue training instead of starting
+    over. That happens only when the data (``data_key`` or its fingerprint),
+    target, split and other hyperparameters are unchanged and the size
+    parameter did not shrink. Cross-validation fold models are kept in the state
+    and grown the same way, so it holds ``cv_folds + 1`` fitted models.
+    ``previous`` is consumed: its models may be grown in place, so discard it
+    if this call raises.
+    """
+    X = data.drop(target_col, axis=1)
+    y = data[target_col]
+    
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state
+    )
+    
+    model_cls = resolve_model(problem_type, model_name)
+    params = dict(model_params or {})
+    growable = model_cls in GROWABLE_PARAMS
+    size = None
+    if growable:
+        param, default = GROWABLE_PARAMS[model_cls]
+        size = int(params.pop(param, None) or default)
+    incremental = incremental and growable
+    
+    signature = None
+    if incremental:
+        # Hashing the data is only needed when the state is kept
+        signature = (
+            data_key or fingerprint_frame(data), target_col, problem_type, model_cls.__name__,
+            test_size, cv_folds, random_state, sorted(params.items())
+        )
+    if not (incremental and previous and previous["signature"] == signature and previous["size"] <= size):
+        previous = None
+    previous_size = previous["size"] if previous else 0
+    
+    start = time.perf_counter()
+    if growable:
+        model = fit_increment(model_cls, params, X_train, y_train, size,
+                              previous and previous["model"], previous_size)
+    else:
+        model = model_cls(**params)
+        model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    cv_scores = fold_models = None
+    if problem_type == "Classification":
+        if incremental:
+            # Same folds as cross_val_score, but each fold model is kept and grown
+            folds = list(check_cv(cv_folds, y, classifier=True).split(X, y))
+            fold_models = [
+                fit_increment(model_cls, params, X.iloc[train], y.iloc[train], size,
+                              previous and previous["fold_models"][i], previous_size)
+                for i, (train, _) in enumerate(folds)
+            ]
+            cv_scores = np.array([
+                fold_model.score(X.iloc[test], y.iloc[test])
+                for fold_model, (_, test) in zip(fold_models, folds)
+            ])
+        else:
+            cv_scores = cross_val_score(model, X, y, cv=cv_folds)
+    metrics = evaluate_model(model, problem_type, X_test, y_test, y_pred, cv_scores)
+    evaluate_seconds = time.perf_counter() - start
+    
+    # Metrics per increment, oldest first
+    history = list(previous["history"]) if previous else []
+    history.append({
+        "size": size,
+        "added": size - previous_size if growable else None,
+        "fit_seconds": fit_seconds,
+        "evaluate_seconds": evaluate_seconds,
+        **{k: v for k, v in metrics.items() if k != "classification_report"}
+    })
+    
+    return {
+        "model": model,
+        "X": X,
+        "X_train": X_train,
+        "X_test": X_test,
+        "y_test": y_test,
+        "y_pred": y_pred,
+        "metrics": metrics,
+        "timings": {"fit": fit_seconds, "evaluate": evaluate_seconds},
+        "continued": previous is not None,
+        "history": history,
+        # Everything needed to continue training later, without the data itself
+        "state": {
+            "signature": signature,
+            "size": size,
+            "model": model,
+            "fold_models": fold_models,
+            "history": history
+        } if incremental else None
+    }
+
 def create_download_button(model, filename="model.pkl"):
     """Create a styled download button for the model"""
     buffer = BytesIO()
@@ -70,12 +249,12 @@ def create_download_button(model, filename="model.pkl"):
     return button_html
 
 def model_training_page():
-    if st.session_state.processed_data is None:
+    data = load_session_dataset('processed_data')
+    if data is None:
         st.warning("🚨 Please preprocess your data first!")
         return
     
     st.title("🚀 Model Training")
-    data = st.session_state.processed_data
     
     # Model selection interface
     st.markdown("### 🤖 Select Your Model")
@@ -109,32 +288,50 @@ def model_training_page():
     with col3:
         random_state = st.number_input("Random State", value=42)
     
+    # Model size (trees, boosting rounds or solver iterations) can be grown incrementally
+    model_params = {}
+    incremental = False
+    model_cls = model_dict[selected_model]
+    if model_cls in GROWABLE_PARAMS:
+        size_param, default_size = GROWABLE_PARAMS[model_cls]
+        col1, col2 = st.columns(2)
+        with col1:
+            model_params[size_param] = st.number_input(
+                f"🌱 {size_param}", min_value=1, value=default_size, step=50
+            )
+        with col2:
+            incremental = st.checkbox(
+                "♻️ Incremental Retraining", value=False,
+                help="If only this value grew since the last run on the same data, "
+                     "continue the previous fit instead of training from scratch. "
+                     "Keeps one model per cross-validation fold in memory for this session."
+            )
+    
     if st.button("🚀 Train Model"):
         with st.spinner("🔮 Training in progress..."):
-            # Prepare data
-            X = data.drop(target_col, axis=1)
-            y = data[target_col]
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=random_state
+            # Split, train and evaluate model.
+            # The previous state is consumed; it is only replaced once training succeeds
+            previous = st.session_state.training_state if incremental else None
+            st.session_state.training_state = None
+            result = train_model(
+                data, target_col, problem_type, selected_model,
+                test_size=test_size, cv_folds=cv_folds, random_state=random_state,
+                model_params=model_params, incremental=incremental, previous=previous,
+                data_key=st.session_state.processed_data
             )
-            
-            # Initialize and train model
-            model = model_dict[selected_model]()
-            model.fit(X_train, y_train)
+            st.session_state.training_state = result["state"]
+            model = result["model"]
+            X, X_train, X_test = result["X"], result["X_train"], result["X_test"]
+            y_test, y_pred = result["y_test"], result["y_pred"]
+            metrics = result["metrics"]
             st.session_state.model = model
             
-            # Evaluate model
-            y_pred = model.predict(X_test)
-            
             # Display results in a nice format
             st.markdown("### 📊 Model Performance")
             
             if problem_type == "Classification":
                 # Classification metrics
-                accuracy = accuracy_score(y_test, y_pred)
-                cv_scores = cross_val_score(model, X, y, cv=cv_folds)
+                accuracy = metrics["accuracy"]
                 
                 # Display metrics in cards
                 col1, col2, col3 = st.columns(3)
@@ -152,7 +349,7 @@ def model_training_page():
                             <h4 style="color: black">🔄 Cross-validation Score</h4>
                             <h2 style="color: #4CAF50">{:.2%} ± {:.2%}</h2>
                         </div>
-                    """.format(cv_scores.mean(), cv_scores.std()*2), unsafe_allow_html=True)
+                    """.format(metrics["cv_mean"], metrics["cv_std"]*2), unsafe_allow_html=True)
                 
                 with col3:
                     st.markdown("""
@@ -164,15 +361,14 @@ def model_training_page():
                 
                 # Classification report
                 st.markdown("### 📋 Detailed Classification Report")
-                report = classification_report(y_test, y_pred, output_dict=True)
+                report = metrics["classification_report"]
                 report_df = pd.DataFrame(report).transpose()
                 st.dataframe(report_df.style.highlight_max(axis=0))
                 
             else:
                 # Regression metrics
-                mse = mean_squared_error(y_test, y_pred)
-                rmse = np.sqrt(mse)
-                r2 = model.score(X_test, y_test)
+                rmse = metrics["rmse"]
+                r2 = metrics["r2"]
                 
                 # Display metrics in cards
                 col1, col2, col3 = st.columns(3)
@@ -200,6 +396,21 @@ def model_training_page():
                         </div>
                     """.format(), unsafe_allow_html=True)
             
+            # Incremental retraining progress
+            if result["continued"]:
+                last_step = result["history"][-1]
+                st.info(f"♻️ Continued the previous fit: trained {last_step['added']} more "
+                        f"{size_param} in {last_step['fit_seconds']:.2f}s instead of all {last_step['size']}")
+            if len(result["history"]) > 1:
+                st.markdown("### 🌱 Metrics per Increment")
+                history_df = pd.DataFrame(result["history"])
+                st.dataframe(history_df, hide_index=True)
+                
+                score_col = "accuracy" if problem_type == "Classification" else "r2"
+                fig = px.line(history_df, x="size", y=score_col, markers=True,
+                              title=f'🌱 {score_col} by {size_param}')
+                st.plotly_chart(fig)
+            
             # Feature importance plot
             if hasattr(model, 'feature_importances_'):
                 st.markdown("### 🔍 Feature Importance Analysis")
@@ -251,5 +462,6 @@ def model_training_page():
                 "Training Set Size": X_train.shape[0],
                 "Test Set Size": X_test.shape[0],
                 "Cross-validation Folds": cv_folds,
-                "Random State": random_state
+                "Random State": random_state,
+                "Hyperparameters": model_params
             })
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from sklearn.preprocessing import StandardScaler, LabelEncoder, MinMaxScaler, RobustScaler
+from datastore import load_session_dataset, store_session_dataset
 
 # Define scaling methods
 SCALING_METHODS = {
@@ -9,13 +10,69 @@ SCALING_METHODS = {
     "💪 RobustScaler (Best for Outliers)": RobustScaler
 }
 
+def resolve_scaler(name):
+    """Look up a scaler class by its display label or class name"""
+    for label, scaler_cls in SCALING_METHODS.items():
+        if name in (label, scaler_cls.__name__):
+            return scaler_cls
+    raise ValueError(f"Unknown scaling method: {name}")
+
+def handle_missing_values(data, col, strategy):
+    """Apply a missing-value strategy to a single column"""
+    if strategy == 'Drop':
+        data = data.dropna(subset=[col])
+    elif strategy == 'Mean':
+        data[col] = data[col].fillna(data[col].mean())
+    elif strategy == 'Median':
+        data[col] = data[col].fillna(data[col].median())
+    elif strategy == 'Mode':
+        data[col] = data[col].fillna(data[col].mode()[0])
+    elif strategy == 'Zero':
+        data[col] = data[col].fillna(0)
+    return data
+
+def scale_features(data, scaler_method, scale_cols):
+    """Fit the selected scaler on the given columns and transform them in place"""
+    scaler = resolve_scaler(scaler_method)()
+    data[scale_cols] = scaler.fit_transform(data[scale_cols])
+    return data
+
+def encode_column(data, col, encoding):
+    """Label- or one-hot encode a categorical column"""
+    if encoding == 'Label Encoding':
+        le = LabelEncoder()
+        data[col] = le.fit_transform(data[col])
+    elif encoding == 'One-Hot Encoding':
+        data = pd.get_dummies(data, columns=[col])
+    return data
+
+def apply_preprocessing(data, steps):
+    """Replay recorded preprocessing steps (see preprocessing_page) on a dataset"""
+    data = data.copy()
+    for step in steps:
+        kind = step['step']
+        if kind == 'missing':
+            data = handle_missing_values(data, step['column'], step['strategy'])
+        elif kind == 'scale':
+            data = scale_features(data, step['method'], step['columns'])
+        elif kind == 'encode':
+            data = encode_column(data, step['column'], step['encoding'])
+        elif kind == 'drop_duplicates':
+            data = data.drop_duplicates()
+        else:
+            raise ValueError(f"Unknown preprocessing step: {kind}")
+    return data
+
 def preprocessing_page():
-    if st.session_state.data is None:
+    data = load_session_dataset('data')
+    if data is None:
         st.warning("🚨 Please upload data first!")
         return
     
     st.title("⚡ Data Preprocessing")
-    data = st.session_state.data.copy()
+    data = data.copy()
+    original_shape = data.shape
+    steps = []
     
     # Preprocessing steps container
     st.markdown("### 🔧 Preprocessing Steps")
@@ -39,16 +96,8 @@ def preprocessing_page():
                 st.metric("Missing %", f"{(data[col].isnull().sum() / len(data) * 100):.1f}%")
             
             if strategy != 'None':
-                if strategy == 'Drop':
-                    data = data.dropna(subset=[col])
-                elif strategy == 'Mean':
-                    data[col] = data[col].fillna(data[col].mean())
-                elif strategy == 'Median':
-                    data[col] = data[col].fillna(data[col].median())
-                elif strategy == 'Mode':
-                    data[col] = data[col].fillna(data[col].mode()[0])
-                elif strategy == 'Zero':
-                    data[col] = data[col].fillna(0)
+                data = handle_missing_values(data, col, strategy)
+                steps.append({'step': 'missing', 'column': col, 'strategy': strategy})
     else:
         st.info("✨ No missing values found!")
     
@@ -69,8 +118,12 @@ def preprocessing_page():
                 numerical_cols
             )
             if scale_cols:
-                scaler = SCALING_METHODS[scaler_method]()
-                data[scale_cols] = scaler.fit_transform(data[scale_cols])
+                data = scale_features(data, scaler_method, scale_cols)
+                steps.append({
+                    'step': 'scale',
+                    'method': SCALING_METHODS[scaler_method].__name__,
+                    'columns': list(scale_cols)
+                })
     
     # 3. Encoding
     st.subheader("3️⃣ Categorical Encoding")
@@ -91,11 +144,9 @@ def preprocessing_page():
             with col3:
                 st.metric("Top Value", data[col].mode()[0])
             
-            if encoding == 'Label Encoding':
-                le = LabelEncoder()
-                data[col] = le.fit_transform(data[col])
-            elif encoding == 'One-Hot Encoding':
-                data = pd.get_dummies(data, columns=[col])
+            if encoding != 'None':
+                data = encode_column(data, col, encoding)
+                steps.append({'step': 'encode', 'column': col, 'encoding': encoding})
     else:
         st.info("✨ No Categorical Column found!")
     
@@ -110,10 +161,12 @@ def preprocessing_page():
             remove_dups = st.checkbox("Remove duplicate rows")
             if remove_dups:
                 data = data.drop_duplicates()
+                steps.append({'step': 'drop_duplicates'})
     
     # Apply preprocessing
     if st.button("⚡ Apply Preprocessing"):
-        st.session_state.processed_data = data
+        store_session_dataset('processed_data', data)
+        st.session_state.preprocessing_steps = steps
         st.success(f"🎉 Preprocessing completed! Shape: {data.shape}")
         
         # Show sample of processed data
@@ -124,6 +177,10 @@ def preprocessing_page():
         st.subheader("📊 Changes Summary")
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Original Shape", f"{st.session_state.data.shape}")
+            st.metric("Original Shape", f"{original_shape}")
         with col2:
             st.metric("Processed Shape", f"{data.shape}")
+        
+        # Recorded plan, reusable as the "preprocessing" list of a batch job
+        st.subheader("📋 Preprocessing Plan")
+        st.json(steps)
@@ -0,0 +1,121 @@
+import json
+import multiprocessing
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+import batch
+from batch import JOB_DEFAULTS, load_config, run_batch, run_job
+from preprocess import apply_preprocessing, encode_column, handle_missing_values, scale_features
+
+
+def write_config(tmp_path, jobs):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": jobs}))
+    return path
+
+
+def test_load_config_fills_defaults_and_name(tmp_path):
+    path = write_config(tmp_path, [{"input": "data/churn.csv", "target": "y", "model": "LinearRegression"}])
+    job = load_config(path)["jobs"][0]
+    assert job["name"] == "churn"
+    assert job["cv_folds"] == 5
+    assert job["preprocessing"] == []
+
+
+@pytest.mark.parametrize("name", ["../x", "/tmp/x", "a/b", "a\\b", "..", ".", ""])
+def test_load_config_rejects_names_outside_output_dir(tmp_path, name):
+    path = write_config(tmp_path, [{"name": name, "input": "a.csv", "target": "y", "model": "LinearRegression"}])
+    with pytest.raises(ValueError, match="invalid name"):
+        load_config(path)
+
+
+def write_csv(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({
+        "a": [float(i % 7) if i % 5 else None for i in range(40)],
+        "b": [i * 0.5 for i in range(40)],
+        "plan": ["x", "y"] * 20,
+        "y": [i % 2 for i in range(40)]
+    }).to_csv(path, index=False)
+    return path
+
+
+def make_job(path, **overrides):
+    return {
+        **JOB_DEFAULTS,
+        "name": "job",
+        "input": str(path),
+        "target": "y",
+        "model": "RandomForestClassifier",
+        "model_params": {"n_estimators": 5},
+        "cv_folds": 2,
+        "preprocessing": [
+            {"step": "missing", "column": "a", "strategy": "Mean"},
+            {"step": "encode", "column": "plan", "encoding": "Label Encoding"}
+        ],
+        **overrides
+    }
+
+
+def test_run_job_writes_artifacts(tmp_path):
+    timings = run_job(make_job(write_csv(tmp_path)), str(tmp_path / "out"))
+    job_dir = tmp_path / "out" / "job"
+
+    metrics = json.loads((job_dir / "metrics.json").read_text())
+    assert set(metrics) == {"model", "problem_type", "rows", "features", "metrics"}
+    assert {"accuracy", "cv_mean", "cv_std"} <= set(metrics["metrics"])
+    assert json.loads((job_dir / "timings.json").read_text()) == pytest.approx(timings)
+    assert {"load", "preprocess", "fit", "evaluate", "save", "total"} <= set(timings)
+    with open(job_dir / "model.pkl", "rb") as f:
+        assert pickle.load(f).n_estimators == 5
+
+
+def test_run_batch_reports_failed_jobs(tmp_path):
+    path = write_csv(tmp_path)
+    config = {"jobs": [make_job(path, name="good"), make_job(tmp_path / "missing.csv", name="bad")]}
+    summary = run_batch(config, output_dir=str(tmp_path / "out"), workers=2)
+
+    assert (summary["succeeded"], summary["failed"]) == (1, 1)
+    assert json.loads((tmp_path / "out" / "summary.json").read_text())["failed"] == 1
+    assert {r["name"]: r["status"] for r in summary["jobs"]} == {"good": "ok", "bad": "error"}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="workers must inherit the patched run_job")
+def test_run_batch_writes_summary_when_a_worker_dies(tmp_path, monkeypatch):
+    def crash(job, output_dir):
+        os._exit(1)
+
+    monkeypatch.setattr(batch, "run_job", crash)
+    config = {"jobs": [make_job(write_csv(tmp_path))]}
+    summary = run_batch(config, output_dir=str(tmp_path / "out"), workers=1)
+
+    assert summary["failed"] == 1
+    assert "Worker failed" in summary["jobs"][0]["error"]
+    assert (tmp_path / "out" / "summary.json").exists()
+
+
+def test_apply_preprocessing_replays_page_steps():
+    data = pd.DataFrame({
+        "a": [1.0, None, 3.0, 3.0],
+        "b": [10, 20, 30, 30],
+        "plan": ["x", "y", "x", "x"]
+    })
+    steps = [
+        {"step": "missing", "column": "a", "strategy": "Median"},
+        {"step": "scale", "method": "MinMaxScaler", "columns": ["a", "b"]},
+        {"step": "encode", "column": "plan", "encoding": "One-Hot Encoding"},
+        {"step": "drop_duplicates"}
+    ]
+
+    expected = data.copy()
+    expected = handle_missing_values(expected, "a", "Median")
+    expected = scale_features(expected, "🌈 MinMaxScaler (Best for Known Bounds)", ["a", "b"])
+    expected = encode_column(expected, "plan", "One-Hot Encoding")
+    expected = expected.drop_duplicates()
+
+    pd.testing.assert_frame_equal(apply_preprocessing(data, steps), expected)
+    assert data["a"].isna().any()
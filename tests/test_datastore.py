@@ -0,0 +1,107 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from datastore import DatasetStore, fingerprint_bytes, fingerprint_frame
+
+
+def make_frame(seed, rows=1000):
+    return pd.DataFrame({"a": range(seed, seed + rows), "b": [float(seed)] * rows})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DatasetStore(memory_limit=10**9, disk_limit=10**9, spill_dir=str(tmp_path))
+    yield store
+    store.clear()
+
+
+def test_fingerprints_depend_on_content_and_options():
+    assert fingerprint_frame(make_frame(0)) == fingerprint_frame(make_frame(0))
+    assert fingerprint_frame(make_frame(0)) != fingerprint_frame(make_frame(1))
+    assert fingerprint_bytes(b"x", "csv", None) != fingerprint_bytes(b"x", "csv", ["a"])
+
+
+def test_put_deduplicates_and_round_trips(store):
+    key = store.put(make_frame(0))
+    assert store.put(make_frame(0)) == key
+    assert store.stats()["in_memory"] == 1
+    pd.testing.assert_frame_equal(store.get_dataframe(key), make_frame(0))
+
+
+def test_lru_entries_spill_to_disk_and_stay_readable(store):
+    first = store.put(make_frame(0))
+    store.memory_limit = pa.Table.from_pandas(make_frame(0)).nbytes
+    second = store.put(make_frame(1))
+    store.get(second)
+
+    assert store.stats()["in_memory"] == 1
+    assert store.stats()["frames"] == 0
+    assert store.stats()["spilled"] == 1
+    assert os.path.exists(os.path.join(store.spill_dir, first + ".arrow"))
+    assert isinstance(store.get(first), pa.Table)
+    pd.testing.assert_frame_equal(store.get_dataframe(first), make_frame(0))
+
+
+def test_mixed_type_frames_fall_back_to_pickle(store):
+    data = pd.DataFrame({"a": [1, "x", 2.5]})
+    key = store.put(data)
+    store.memory_limit = 0
+    store.put(make_frame(0))
+    assert os.path.exists(os.path.join(store.spill_dir, key + ".pkl"))
+    pd.testing.assert_frame_equal(store.get_dataframe(key), data)
+
+
+def test_disk_cap_deletes_oldest_spill_files(store):
+    store.memory_limit = 0
+    first = store.put(make_frame(0))
+    store.disk_limit = store.stats()["disk_used"]
+    second = store.put(make_frame(1))
+
+    assert first not in store
+    assert not os.path.exists(os.path.join(store.spill_dir, first + ".arrow"))
+    assert second in store
+    with pytest.raises(KeyError):
+        store.get(first)
+
+
+def test_missing_spill_file_raises_key_error(store):
+    store.memory_limit = 0
+    key = store.put(make_frame(0))
+    os.remove(os.path.join(store.spill_dir, key + ".arrow"))
+    with pytest.raises(KeyError):
+        store.get(key)
+    assert key not in store
+    assert store.stats()["disk_used"] == 0
+
+
+def test_clear_removes_spill_files(store):
+    store.memory_limit = 0
+    store.put(make_frame(0))
+    store.clear()
+    assert os.listdir(store.spill_dir) == []
+
+
+def test_frames_are_materialized_once_and_shared(store):
+    store.memory_limit = 0
+    key = store.put(make_frame(0))
+    store.memory_limit = 10**9
+
+    data = store.get_dataframe(key)
+    assert store.get_dataframe(key) is data
+    assert store.stats()["frames"] == 1
+    assert store.stats()["memory_used"] == data.memory_usage(deep=True).sum()
+
+
+def test_frames_count_against_the_cap_and_are_dropped_first(store):
+    data = make_frame(0)
+    key = store.put(data)
+    assert store.get_dataframe(key) is data
+    assert store.stats()["memory_used"] > pa.Table.from_pandas(data).nbytes
+
+    store.memory_limit = store.stats()["memory_used"] - 1
+    store.put(make_frame(1))
+    assert store.stats()["frames"] == 0
+    pd.testing.assert_frame_equal(store.get_dataframe(key), data)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification, make_regression
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBRegressor
+
+from modeltrain import fit_increment, train_model
+
+
+@pytest.fixture
+def classification():
+    X, y = make_classification(n_samples=200, n_features=6, random_state=0)
+    return pd.DataFrame(X, columns=[f"f{i}" for i in range(6)]), pd.Series(y)
+
+
+def test_random_forest_increment_matches_fresh_fit(classification):
+    X, y = classification
+    params = {"random_state": 0}
+    grown = fit_increment(RandomForestClassifier, params, X, y, 20)
+    grown = fit_increment(RandomForestClassifier, params, X, y, 50, grown, 20)
+    fresh = fit_increment(RandomForestClassifier, params, X, y, 50)
+
+    assert len(grown.estimators_) == 50
+    assert grown.get_params()["warm_start"] is False
+    assert grown.get_params()["n_estimators"] == 50
+    np.testing.assert_array_equal(grown.predict_proba(X), fresh.predict_proba(X))
+
+
+def test_xgboost_increment_matches_fresh_fit():
+    X, y = make_regression(n_samples=200, n_features=5, random_state=0)
+    params = {"random_state": 0}
+    grown = fit_increment(XGBRegressor, params, X, y, 20)
+    grown = fit_increment(XGBRegressor, params, X, y, 50, grown, 20)
+    fresh = fit_increment(XGBRegressor, params, X, y, 50)
+
+    assert grown.get_params()["n_estimators"] == 50
+    assert grown.get_booster().num_boosted_rounds() == 50
+    np.testing.assert_allclose(grown.predict(X), fresh.predict(X), rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.ConvergenceWarning")
+def test_logistic_regression_increment_continues_towards_fresh_fit(classification):
+    X, y = classification
+    grown = fit_increment(LogisticRegression, {}, X, y, 2)
+    grown = fit_increment(LogisticRegression, {}, X, y, 1000, grown, 2)
+    fresh = fit_increment(LogisticRegression, {}, X, y, 1000)
+
+    np.testing.assert_allclose(grown.coef_, fresh.coef_, atol=1e-3)
+    assert grown.get_params()["warm_start"] is False
+    assert grown.get_params()["max_iter"] == 1000
+
+
+def test_failed_increment_restores_parameters(classification):
+    X, y = classification
+    model = fit_increment(RandomForestClassifier, {"random_state": 0}, X, y, 10)
+    with pytest.raises(ValueError):
+        fit_increment(RandomForestClassifier, {"random_state": 0}, X, y.where(y > 0), 30, model, 10)
+    assert model.get_params()["n_estimators"] == 10
+    assert len(model.estimators_) == 10
+
+
+def test_train_model_continues_only_matching_state(classification):
+    X, y = classification
+    data = X.assign(target=y)
+    kwargs = {"cv_folds": 3, "incremental": True, "data_key": "frame-test"}
+    first = train_model(data, "target", "Classification", "RandomForestClassifier",
+                        model_params={"n_estimators": 10, "random_state": 0}, **kwargs)
+    second = train_model(data, "target", "Classification", "RandomForestClassifier",
+                         model_params={"n_estimators": 25, "random_state": 0},
+                         previous=first["state"], **kwargs)
+
+    assert second["continued"]
+    assert [step["added"] for step in second["history"]] == [10, 15]
+    assert all(len(m.estimators_) == 25 for m in second["state"]["fold_models"])
+
+    other = train_model(data, "target", "Classification", "RandomForestClassifier",
+                        model_params={"n_estimators": 30, "random_state": 1},
+                        previous=second["state"], **kwargs)
+    assert not other["continued"]
+    assert len(other["history"]) == 1
+
+
+def test_train_model_keeps_no_state_unless_incremental(classification):
+    X, y = classification
+    result = train_model(X.assign(target=y), "target", "Classification", "RandomForestClassifier",
+                         cv_folds=3, model_params={"n_estimators": 10})
+    assert result["state"] is None
+    assert not result["continued"]
@@ -0,0 +1,111 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+import upload
+from upload import load_data, peek_schema
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "id": range(10),
+        "score": [float(i) / 2 for i in range(10)],
+        "name": [f"n{i}" for i in range(10)],
+        "day": pd.date_range("2024-01-01", periods=10)
+    })
+
+
+def test_csv_projection_and_filters(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    schema = peek_schema(str(path), "csv")
+    assert schema["columns"] == ["id", "score", "name", "day"]
+
+    data = load_data(str(path), "csv", columns=["name"], filters=[("id", ">=", "7")])
+    assert list(data.columns) == ["name"]
+    assert data["name"].tolist() == ["n7", "n8", "n9"]
+
+
+def test_csv_filter_survives_chunks_with_other_dtypes(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"x": ["1", "2", "3", "oops", "5", "6"]}).to_csv(path, index=False)
+    monkeypatch.setattr(upload, "PEEK_ROWS", 3)
+    monkeypatch.setattr(upload, "CSV_CHUNK_ROWS", 2)
+
+    data = load_data(str(path), "csv", filters=[("x", ">=", "3")])
+    assert data["x"].astype(str).tolist() == ["3", "5", "6"]
+
+
+def test_parquet_pushdown_casts_text_values(tmp_path, frame):
+    path = tmp_path / "data.parquet"
+    frame.to_parquet(path)
+
+    data = load_data(str(path), "parquet", columns=["id"],
+                     filters=[("score", ">", "2"), ("day", "<", "2024-01-09")])
+    assert data["id"].tolist() == [5, 6, 7]
+
+
+def test_bad_filter_value_names_the_filter(tmp_path, frame):
+    path = tmp_path / "data.parquet"
+    frame.to_parquet(path)
+    with pytest.raises(ValueError, match="Row filter 'id >= abc'"):
+        load_data(str(path), "parquet", filters=[("id", ">=", "abc")])
+    with pytest.raises(ValueError, match="unknown column"):
+        load_data(str(path), "parquet", filters=[("nope", "==", "1")])
+
+
+def test_excel_sheet_selection(tmp_path, frame):
+    path = tmp_path / "data.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        frame.to_excel(writer, sheet_name="first", index=False)
+        frame[["id", "name"]].to_excel(writer, sheet_name="second", index=False)
+
+    schema = peek_schema(str(path), "xlsx", sheet_name="second")
+    assert schema["sheets"] == ["first", "second"]
+    assert schema["columns"] == ["id", "name"]
+
+    data = load_data(str(path), "xlsx", columns=["name"], filters=[("id", "<", "2")], sheet_name="second")
+    assert data["name"].tolist() == ["n0", "n1"]
+
+
+def test_json_lines_projection_and_filters(tmp_path, frame):
+    path = tmp_path / "data.json"
+    frame.drop(columns="day").to_json(path, orient="records", lines=True)
+
+    assert peek_schema(str(path), "json")["columns"] == ["id", "score", "name"]
+    data = load_data(str(path), "json", columns=["name"], filters=[("id", "==", "3")])
+    assert data.to_dict("list") == {"name": ["n3"]}
+
+
+def test_json_lines_record_crossing_peek_boundary():
+    first = json.dumps({"id": 1, "text": "a" * (upload.PEEK_BYTES - 100)})
+    second = json.dumps({"id": 2, "text": "b" * 500})
+    source = io.BytesIO(f"{first}\n{second}\n".encode())
+
+    data = load_data(source, "json", columns=["id"])
+    assert data["id"].tolist() == [1, 2]
+
+
+def test_json_document_is_not_peekable(tmp_path, frame):
+    path = tmp_path / "data.json"
+    frame.drop(columns="day").to_json(path, orient="records")
+
+    assert peek_schema(str(path), "json") is None
+    data = load_data(str(path), "json", columns=["id"], filters=[("id", "<", 2)])
+    assert data["id"].tolist() == [0, 1]
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_bool_filters_accept_only_explicit_values(tmp_path, extension):
+    path = tmp_path / f"data.{extension}"
+    data = pd.DataFrame({"id": range(4), "flag": [True, False, True, False]})
+    data.to_csv(path, index=False) if extension == "csv" else data.to_parquet(path)
+
+    assert load_data(str(path), extension, filters=[("flag", "==", "No")])["id"].tolist() == [1, 3]
+    assert load_data(str(path), extension, filters=[("flag", "==", "true")])["id"].tolist() == [0, 2]
+    with pytest.raises(ValueError, match="Row filter 'flag == Ture'"):
+        load_data(str(path), extension, filters=[("flag", "==", "Ture")])
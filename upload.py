@@ -1,11 +1,312 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+import io
+import json
+import operator
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 from xgboost import XGBClassifier
+from datastore import fingerprint_bytes, get_dataset_store, load_session_dataset, store_session_dataset
+
+SUPPORTED_FORMATS = ['csv', 'xlsx', 'xls', 'json', 'parquet']
+
+
+# Row filters are (column, operator, value) tuples, the format pd.read_parquet takes
+FILTER_OPERATORS = {
+    '==': (operator.eq, pc.equal),
+    '!=': (operator.ne, pc.not_equal),
+    '<': (operator.lt, pc.less),
+    '<=': (operator.le, pc.less_equal),
+    '>': (operator.gt, pc.greater),
+    '>=': (operator.ge, pc.greater_equal)
+}
+
+# Accepted text for filters on boolean columns
+BOOL_VALUES = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+PEEK_ROWS = 100
+PEEK_BYTES = 64 * 1024
+CSV_CHUNK_ROWS = 100_000
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+def _read_head(source, size=PEEK_BYTES):
+    _rewind(source)
+    if hasattr(source, 'read'):
+        head = source.read(size)
+    else:
+        with open(source, 'rb') as f:
+            head = f.read(size)
+    _rewind(source)
+    return head
+
+def _json_lines_head(source):
+    """Complete lines from the start of the file"""
+    head = _read_head(source)
+    if len(head) < PEEK_BYTES:
+        return head  # The whole file
+    return head[:head.rfind(b'\n') + 1]
+
+def _json_format(source):
+    """'lines' (one record per line), 'document' (a single JSON document), or
+    None when the head of the file is not enough to tell"""
+    lines = [line for line in _json_lines_head(source).splitlines() if line.strip()]
+    if not lines:
+        return None
+    try:
+        records = [json.loads(line) for line in lines[:2]]
+    except ValueError:
+        # A complete line that is not JSON on its own: a pretty-printed document
+        return 'document'
+    if not all(isinstance(record, dict) for record in records):
+        return 'document'
+    # A single line may also be a whole column-oriented document
+    if len(records) > 1 or not any(isinstance(v, (dict, list)) for v in records[0].values()):
+        return 'lines'
+    return 'document'
+
+def _filter_error(col, op, value, error):
+    return f"Row filter '{col} {op} {value}' failed: {error}"
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text not in BOOL_VALUES:
+        raise ValueError(f"not a boolean: {value!r}")
+    return BOOL_VALUES[text]
+
+def _cast_filter_value(col, op, value, dtype):
+    """Convert a filter value (often typed as text) to the peeked column type"""
+    try:
+        if isinstance(dtype, pa.DataType):
+            if pa.types.is_dictionary(dtype):
+                dtype = dtype.value_type
+            if pa.types.is_boolean(dtype):
+                return _to_bool(value)
+            return pa.scalar(value).cast(dtype).as_py()
+        if pd.api.types.is_bool_dtype(dtype):
+            return _to_bool(value)
+        if pd.api.types.is_numeric_dtype(dtype):
+            return pd.to_numeric(value)
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return pd.Timestamp(value)
+        return value
+    except (ValueError, TypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise ValueError(_filter_error(col, op, value, f"value does not match column type {dtype}")) from e
+
+def _prepare_filters(source, file_extension, filters, sheet_name):
+    """Validate filters and cast their values against the peeked schema"""
+    schema = peek_schema(source, file_extension, sheet_name=sheet_name)
+    prepared = []
+    for col, op, value in filters:
+        if op not in FILTER_OPERATORS:
+            raise ValueError(_filter_error(col, op, value, f"unknown operator '{op}'"))
+        if schema is not None:
+            if col not in schema['dtypes']:
+                raise ValueError(_filter_error(col, op, value, f"unknown column '{col}'"))
+            value = _cast_filter_value(col, op, value, schema['dtypes'][col])
+        prepared.append((col, op, value))
+    return prepared
+
+def _filter_frame(data, filters):
+    for col, op, value in filters:
+        column = data[col]
+        # Later CSV chunks may infer a different dtype than the peeked head
+        if pd.api.types.is_number(value) and not isinstance(value, bool) \
+                and not pd.api.types.is_numeric_dtype(column):
+            column = pd.to_numeric(column, errors='coerce')
+        elif isinstance(value, pd.Timestamp) and not pd.api.types.is_datetime64_any_dtype(column):
+            column = pd.to_datetime(column, errors='coerce')
+        try:
+            mask = FILTER_OPERATORS[op][0](column, value)
+        except TypeError as e:
+            raise ValueError(_filter_error(col, op, value, e)) from e
+        data = data[mask]
+    return data
+
+def _filter_table(table, filters):
+    for col, op, value in filters:
+        try:
+            mask = FILTER_OPERATORS[op][1](table[col], value)
+        except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            raise ValueError(_filter_error(col, op, value, e)) from e
+        table = table.filter(mask)
+    return table
+
+def _arrow_schema_info(schema):
+    return {
+        'sheets': None,
+        'columns': list(schema.names),
+        'dtypes': {field.name: field.type for field in schema}
+    }
+
+def peek_schema(source, file_extension, sheet_name=0):
+    """Read sheet names, column names and column types without loading the data.
+
+    Returns None for formats with no header to peek at (plain JSON documents).
+    """
+    sheets = None
+    if file_extension == 'parquet':
+        _rewind(source)
+        schema = pq.read_schema(source)  # Footer only
+        _rewind(source)
+        return _arrow_schema_info(schema)
+    if file_extension == 'json':
+        if _json_format(source) != 'lines':
+            return None
+        return _arrow_schema_info(pa_json.read_json(io.BytesIO(_json_lines_head(source))).schema)
+    if file_extension == 'csv':
+        _rewind(source)
+        head = pd.read_csv(source, nrows=PEEK_ROWS)
+    elif file_extension in ['xlsx', 'xls']:
+        _rewind(source)
+        sheets = pd.ExcelFile(source).sheet_names
+        _rewind(source)
+        head = pd.read_excel(source, sheet_name=sheet_name, nrows=PEEK_ROWS)
+    else:
+        raise ValueError(f"Unsupported file format: {file_extension}")
+    _rewind(source)
+    return {
+        'sheets': sheets,
+        'columns': list(head.columns),
+        'dtypes': head.dtypes.to_dict()
+    }
+
+def load_data(source, file_extension, columns=None, filters=None, sheet_name=0):
+    """Load a dataset from a path or file-like object based on its extension.
+
+    ``columns`` and ``filters`` are pushed down into the reader where the format
+    allows it, so unselected columns and filtered-out rows are never materialized.
+    Filter values are cast to the column types, so they may be given as text.
+    """
+    filters = [tuple(f) for f in filters or []]
+    if filters:
+        filters = _prepare_filters(source, file_extension, filters, sheet_name)
+    # Filter columns have to be read even when they are not selected
+    usecols = None
+    if columns is not None:
+        usecols = list(columns) + [col for col, _, _ in filters if col not in columns]
+
+    _rewind(source)
+    if file_extension == 'csv':
+        if filters:
+            # Filter chunk by chunk so unmatched rows never pile up in memory
+            chunks = pd.read_csv(source, usecols=usecols, chunksize=CSV_CHUNK_ROWS)
+            filtered = [_filter_frame(chunk, filters) for chunk in chunks]
+            data = pd.concat(filtered, ignore_index=True) if filtered else pd.DataFrame(columns=usecols)
+            filters = []
+        else:
+            data = pd.read_csv(source, usecols=usecols)
+    elif file_extension in ['xlsx', 'xls']:
+        data = pd.read_excel(source, sheet_name=sheet_name, usecols=usecols)
+    elif file_extension == 'json':
+        data = _read_json(source, usecols, filters)
+        filters = []
+    elif file_extension == 'parquet':
+        try:
+            return pd.read_parquet(source, columns=columns, filters=filters or None)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            if not filters:
+                raise
+            raise ValueError(f"Row filters {filters} could not be applied: {e}") from e
+    else:
+        raise ValueError(f"Unsupported file format: {file_extension}")
+
+    data = _filter_frame(data, filters)
+    if columns is not None:
+        data = data[list(columns)]
+    return data
+
+def _read_json(source, usecols, filters):
+    json_format = _json_format(source)
+    if json_format != 'document':
+        # JSON-lines, or a head too short to tell: try the pyarrow reader first
+        try:
+            table = _read_json_lines(source, usecols)
+        except pa.ArrowInvalid:
+            if json_format == 'lines':
+                raise
+        else:
+            return _filter_table(table, filters).to_pandas()
+    _rewind(source)
+    return _filter_frame(pd.read_json(source), filters)
+
+def _read_json_lines(source, usecols):
+    if usecols is None:
+        _rewind(source)
+        return pa_json.read_json(source)
+    try:
+        # Project by parsing only the selected fields; types come from the head of the file
+        head_schema = pa_json.read_json(io.BytesIO(_json_lines_head(source))).schema
+        parse_options = pa_json.ParseOptions(
+            explicit_schema=pa.schema([head_schema.field(col) for col in usecols]),
+            unexpected_field_behavior='ignore'
+        )
+        _rewind(source)
+        return pa_json.read_json(source, parse_options=parse_options)
+    except (pa.ArrowInvalid, KeyError):
+        # The head did not show every selected column, or its types did not hold
+        _rewind(source)
+        return pa_json.read_json(source).select(usecols)
+
+@st.cache_data(max_entries=32)
+def _peek_upload(file_id, file_extension, sheet_name, _uploaded_file):
+    # Reruns of the upload page reuse the peek instead of reopening the file
+    return peek_schema(_uploaded_file, file_extension, sheet_name=sheet_name)
+
+def load_options_section(uploaded_file, file_extension):
+    """Let the user pick a sheet, columns and row filters.
+
+    Returns (sheet_name, columns, filters) once "Load Data" is pressed, else None.
+    """
+    st.subheader("🔍 Load Options")
+    schema = _peek_upload(uploaded_file.file_id, file_extension, 0, uploaded_file)
+    sheet_name = 0
+    all_columns = None
+    if schema is None:
+        st.info("ℹ️ Column and row selection is available for CSV, Excel, Parquet and JSON-lines files")
+    else:
+        if schema['sheets'] and len(schema['sheets']) > 1:
+            sheet_name = st.selectbox("📑 Sheet", schema['sheets'])
+            schema = _peek_upload(uploaded_file.file_id, file_extension, sheet_name, uploaded_file)
+        all_columns = schema['columns']
+        filter_count = st.number_input("🧹 Row filters", min_value=0, max_value=5, value=0)
+
+    # Nothing is read until the form is submitted
+    columns, filters = None, []
+    with st.form("load_options"):
+        if all_columns is not None:
+            columns = st.multiselect("📋 Columns to load", all_columns,
+                                     help="Leave empty to load every column")
+            for i in range(int(filter_count)):
+                col1, col2, col3 = st.columns([2, 1, 2])
+                with col1:
+                    col = st.selectbox("Column", all_columns, key=f"filter_col_{i}")
+                with col2:
+                    op = st.selectbox("Operator", list(FILTER_OPERATORS), key=f"filter_op_{i}")
+                with col3:
+                    value = st.text_input("Value", key=f"filter_value_{i}")
+                if value != '':
+                    filters.append((col, op, value))
+        submitted = st.form_submit_button("📥 Load Data")
+
+    if not submitted:
+        return None
+    # No selection, or everything selected: skip projection so the file is read as-is
+    if not columns or set(columns) == set(all_columns):
+        columns = None
+    return sheet_name, columns, filters
 
 def data_upload_page():
     st.title("📤 Data Upload")
@@ -22,7 +323,7 @@ def data_upload_page():
     """, unsafe_allow_html=True)
 
     # File uploader (supports multiple formats)
-    uploaded_file = st.file_uploader("Choose a file", type=['csv', 'xlsx', 'xls', 'json', 'parquet'], key="file_uploader")
+    uploaded_file = st.file_uploader("Choose a file", type=SUPPORTED_FORMATS, key="file_uploader")
 
     if uploaded_file:
         try:
@@ -47,23 +348,35 @@ def data_upload_page():
                     </div>
                 """, unsafe_allow_html=True)
 
-                if file_extension == 'csv':
-                    data = pd.read_csv(uploaded_file)
-                elif file_extension in ['xlsx', 'xls']:
-                    data = pd.read_excel(uploaded_file)
-                elif file_extension == 'json':
-                    data = pd.read_json(uploaded_file)
-                elif file_extension == 'parquet':
-                    data = pd.read_parquet(uploaded_file)
-                else:
+                if file_extension not in SUPPORTED_FORMATS:
                     st.error("❌ Unsupported file format!")
                     return
+                load_options = load_options_section(uploaded_file, file_extension)
+                source_id = (uploaded_file.name, uploaded_file.size)
+                if load_options is not None:
+                    sheet_name, columns, filters = load_options
+
+                    # Files already loaded by any session are reused from the shared store
+                    key = fingerprint_bytes(uploaded_file.getvalue(), file_extension, sheet_name, columns, filters)
+                    try:
+                        data = get_dataset_store().get_dataframe(key)
+                    except KeyError:
+                        data = load_data(uploaded_file, file_extension, columns=columns,
+                                         filters=filters, sheet_name=sheet_name)
 
-                st.session_state.data = data  # Store dataset in session state
+                    store_session_dataset('data', data, key=key)  # Session keeps only a reference
+                    st.session_state.data_source = source_id
 
-                # Success message with dataset summary
-                st.success("🎉 Dataset uploaded successfully!")
-                st.snow()  # Add celebratory balloons animation
+                    # Success message with dataset summary
+                    st.success("🎉 Dataset uploaded successfully!")
+                    st.snow()  # Add celebratory balloons animation
+                elif st.session_state.data_source != source_id:
+                    st.info("👆 Choose what to load, then press **📥 Load Data**")
+                    return
+
+                data = load_session_dataset('data')
+                if data is None:
+                    return
 
                 # Display dataset metrics in columns
                 col1, col2, col3 = st.columns(3)
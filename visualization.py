@@ -3,17 +3,17 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from datastore import load_session_dataset
 
 def visualization_page():
-    if st.session_state.data is None:
+    data = load_session_dataset('data')
+    if data is None:
         st.warning("🚨 Please upload data first!")
         return
     
     st.title("📊 Visualization")
     st.markdown("### Explore your data through beautiful visualizations! ✨")
     
-    data = st.session_state.data
-    
     # Smart sampling for large datasets
     if data.shape[0] > 10000:
         sample_size = st.slider("Sample size for visualization", 1000, min(10000, data.shape[0]), 5000)